@@ -30,6 +30,10 @@ def find_verbs(root: Path) -> set[str]:
         )
         for match in r:
             verbs.add(match.group('verb'))
+        r = re.finditer(r'util\.protontricks_many\s*\((?P<verbs>[^)]*)\)', f)
+        for match in r:
+            args = re.finditer(r"('|\")(?P<verb>.*?)\1", match.group('verbs'))
+            verbs.update(arg.group('verb') for arg in args)
 
     return verbs
 
@@ -20,13 +20,12 @@ def main() -> None:
     hashsum_file = '173cac0a7931989d66338e0d7779e451f2f01b2377903df7954d86c07c1bc8fb'
     tmp = f'{mkdtemp()}/xaudio2_8.dll.gz'
     hashsum = sha256()
-    path_dll = f'{util.get_game_install_path()}/xaudio2_8.dll'
+    install_dir = util.get_game_install_path()
+    path_dll = f'{install_dir}/xaudio2_8.dll'
 
     # Full Metal Daemon from gog will not have the xaudio2_8.dll
     if os.path.exists(path_dll):
-        log.info(
-            f"xaudio2_8.dll exists in '{util.get_game_install_path()}', skipping..."
-        )
+        log.info(f"xaudio2_8.dll exists in '{install_dir}', skipping...")
         return
 
     # Download the archive
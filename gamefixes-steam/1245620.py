@@ -1,13 +1,22 @@
 """Game fix for Elden Ring: Create the `DLC.bdt` and `DLC.bhd` files to work around the "Inappropriate activity detected" error for players that don't own the DLC"""
 
-from pathlib import Path
+import os
 from protonfixes import util
 
 
 def main() -> None:
-    game_dir = Path(util.get_game_install_path()) / 'Game'
+    game_dir = os.path.join(util.get_game_install_path(), 'Game')
     # Create the DLC.bdt file if it doesn't already exist, which is known to fix Easy AntiCheat not working for players that don't own the DLC
     # A blank file is enough to get multiplayer working
-    (game_dir / 'DLC.bdt').touch(exist_ok=True)
     # Now also needs DLC.bhd after 1.14 patch
-    (game_dir / 'DLC.bhd').touch(exist_ok=True)
+    for name in ('DLC.bdt', 'DLC.bhd'):
+        # O_EXCL fails on existing files, so they are neither opened nor truncated
+        try:
+            fd = os.open(
+                os.path.join(game_dir, name),
+                os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_CLOEXEC,
+                0o644,
+            )
+        except FileExistsError:
+            continue
+        os.close(fd)
@@ -5,7 +5,5 @@ from protonfixes import util
 
 def main() -> None:
     # Based on https://www.digitalcombatsimulator.com/en/support/faq/SteamDeck/
-    util.protontricks('d3dx11_43')
-    util.protontricks('d3dcompiler_43')
-    util.protontricks('d3dcompiler_47')
+    util.protontricks_many('d3dx11_43', 'd3dcompiler_43', 'd3dcompiler_47')
     util.winedll_override('wbemprox', 'n')  # doesn't seem to be strictly needed
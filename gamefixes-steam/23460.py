@@ -4,7 +4,6 @@ Videos still don't work.
 """
 
 import os
-import subprocess
 from protonfixes import util
 
 
@@ -13,6 +12,9 @@ def main() -> None:
     # Videos play and audio works but screen is black.
     # util.protontricks('quartz')
     # util.protontricks('klite')
-    if os.path.isdir('./data/shared/videos'):
-        subprocess.call(['mv', './data/shared/videos', './data/shared/_videos'])
+    # Missing source (already renamed) or an existing target are both fine
+    try:
+        os.rename('./data/shared/videos', './data/shared/_videos')
+    except OSError:
+        pass
     util.winedll_override('libvkd3d-1', 'n')
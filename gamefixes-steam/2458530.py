@@ -8,6 +8,4 @@ def main() -> None:
 
     Fixes in-game video playback for the intro and ending.
     """
-    util.protontricks('quartz')
-    util.protontricks('wmp11')
-    util.protontricks('qasf')
+    util.protontricks_many('quartz', 'wmp11', 'qasf')
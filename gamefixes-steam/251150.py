@@ -4,6 +4,4 @@ from protonfixes import util
 
 
 def main() -> None:
-    util.protontricks('quartz')  # Cutscene fixes
-    util.protontricks('amstream')
-    util.protontricks('lavfilters')
+    util.protontricks_many('quartz', 'amstream', 'lavfilters')  # Cutscene fixes
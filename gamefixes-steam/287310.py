@@ -6,5 +6,4 @@ from protonfixes import util
 def main() -> None:
     """Sets the necessary dll overrides for the wrappers that are shipped with the game"""
     # Set overrides
-    util.winedll_override('ddraw', 'n')
-    util.winedll_override('dinput', 'n')
+    util.winedll_override_many({'ddraw': 'n', 'dinput': 'n'})
@@ -5,14 +5,10 @@ from protonfixes import util
 
 def main() -> None:
     """Install directsound libraries"""
-    util.protontricks('dmime')
-    util.protontricks('dmloader')
-    util.protontricks('dmsynth')
-    util.protontricks('dmusic')
-    util.protontricks('dsound')
-    util.protontricks('dswave')
+    util.protontricks_many(
+        'dmime', 'dmloader', 'dmsynth', 'dmusic', 'dsound', 'dswave', 'sound=alsa'
+    )
     util.winedll_override('streamci', 'n')
-    util.protontricks('sound=alsa')
 
     """ Fix for audio stutter/desync
     """
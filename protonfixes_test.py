@@ -3,9 +3,12 @@ import os
 import tempfile
 from pathlib import Path
 from unittest.mock import patch, mock_open
+import shutil
+import sys
 import io
 import urllib.request
 import fix
+import util
 
 
 class TestProtonfixes(unittest.TestCase):
@@ -374,5 +377,129 @@ class TestProtonfixes(unittest.TestCase):
         result = func()
         self.assertEqual(result, 'UNKNOWN')
 
+
+class TestUtil(unittest.TestCase):
+    def setUp(self):
+        self.env = {
+            'STEAM_COMPAT_DATA_PATH': '',
+        }
+        self.compat = Path(tempfile.mkdtemp())
+        self.pfx = self.compat.joinpath('pfx')
+        self.pfx.mkdir()
+        os.environ['STEAM_COMPAT_DATA_PATH'] = self.compat.as_posix()
+        util.protonprefix.cache_clear()
+        util._winetricks_logs.clear()
+
+    def tearDown(self):
+        for key in self.env:
+            if key in os.environ:
+                os.environ.pop(key)
+        util._winetricks_logs.clear()
+        util._once_done.clear()
+        shutil.rmtree(self.pfx)
+        self.compat.rmdir()
+
+    def testCheckInstalled(self):
+        """Find regular and 'verb=param' verbs in the winetricks log"""
+        self.pfx.joinpath('winetricks.log').write_text(
+            'quartz\nsound=pulse\nwmp11\nsound=alsa\n', encoding='ascii'
+        )
+        self.assertTrue(util.checkinstalled('quartz'))
+        self.assertTrue(util.checkinstalled('sound=alsa'))
+        self.assertFalse(util.checkinstalled('sound=pulse'))
+        self.assertFalse(util.checkinstalled('dsound'))
+
+    def testCheckInstalledNoLog(self):
+        """Without a winetricks log, no verb is installed"""
+        self.assertFalse(util.checkinstalled('quartz'))
+
+    def testCheckInstalledForced(self):
+        """Forcing a verb invalidates the cached log"""
+        self.assertFalse(util.checkinstalled('quartz'))
+        util._forceinstalled('quartz')
+        self.assertTrue(util.checkinstalled('quartz'))
+
+    def testCaseInsensitiveName(self):
+        """Resolve a path with a differently-cased directory and file"""
+        self.pfx.joinpath('System').mkdir()
+        self.pfx.joinpath('System', 'GOTHIC.INI').touch()
+        path = self.pfx.joinpath('system', 'gothic.ini').as_posix()
+        result = util._get_case_insensitive_name(path)
+        self.assertEqual(result, self.pfx.joinpath('System', 'GOTHIC.INI').as_posix())
+        self.pfx.joinpath('System', 'GOTHIC.INI').unlink()
+        self.pfx.joinpath('System').rmdir()
+
+    def testCaseInsensitiveNameMissing(self):
+        """Keep the requested case for path components that do not exist"""
+        path = self.pfx.joinpath('system', 'gothic.ini').as_posix()
+        result = util._get_case_insensitive_name(path)
+        self.assertEqual(result, path)
+
+    def testSetXmlOptions(self):
+        """Insert a line after the matching XML line, only once"""
+        xml_file = self.pfx.joinpath('game.exe.config')
+        xml_file.write_text(
+            '<configuration>\n<runtime>\n</runtime>\n</configuration>\n',
+            encoding='utf-8',
+        )
+        xml_path = xml_file.as_posix()
+        self.assertTrue(util.set_xml_options('<runtime>', '<opt/>', xml_path))
+        self.assertFalse(util.set_xml_options('<runtime>', '<opt/>', xml_path))
+        self.assertEqual(
+            xml_file.read_text(encoding='utf-8'),
+            '<configuration>\n<runtime>\n<opt/>\n</runtime>\n</configuration>\n',
+        )
+
+    def testReplaceCommand(self):
+        """Replace matching arguments only, case insensitive by default"""
+        argv = ['proton', 'waitforexitandrun', 'C:\\Game\\Launcher.exe']
+        with patch.object(sys, 'argv', argv):
+            self.assertTrue(util.replace_command('launcher.exe', 'Game.exe'))
+            self.assertEqual(
+                sys.argv, ['proton', 'waitforexitandrun', 'C:\\Game\\Game.exe']
+            )
+            self.assertFalse(util.replace_command('missing.exe', 'Game.exe'))
+
+    def testOnce(self):
+        """Run a function decorated with once only the first time"""
+        calls = []
+
+        @util.once
+        def func():
+            calls.append(True)
+
+        func()
+        func()
+        self.assertEqual(len(calls), 1)
+        marker = self.pfx.joinpath(
+            'drive_c/protonfixes/run', f'{__name__}.func'
+        )
+        self.assertTrue(marker.is_file())
+
+        # A new process only sees the marker file
+        util._once_done.clear()
+        func()
+        self.assertEqual(len(calls), 1)
+
+    def testCpuTopologyNoSmtLimit(self):
+        """Limit the physical core count to core_limit"""
+        with patch('util.is_smt_enabled', return_value=True), patch(
+            'util.get_cpu_count', return_value=16
+        ), patch('util.set_cpu_topology', return_value=True) as set_topology:
+            util.set_cpu_topology_nosmt()
+            set_topology.assert_called_with(8, False)
+            util.set_cpu_topology_nosmt(core_limit=4)
+            set_topology.assert_called_with(4, False)
+            util.set_cpu_topology_nosmt(core_limit=12)
+            set_topology.assert_called_with(8, False)
+
+    def testCountCpuList(self):
+        """Count the cpus in sysfs cpu lists"""
+        self.assertEqual(util._count_cpu_list('0\n'), 1)
+        self.assertEqual(util._count_cpu_list('0,8\n'), 2)
+        self.assertEqual(util._count_cpu_list('0-3,8-11\n'), 8)
+        self.assertEqual(util._count_cpu_list(''), 0)
+
+
 if __name__ == '__main__':
     unittest.main()
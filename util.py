@@ -10,6 +10,7 @@ import signal
 import tarfile
 import zipfile
 import subprocess
+import time
 import urllib.request
 import functools
 from socket import socket, AF_INET, SOCK_DGRAM
@@ -29,43 +30,53 @@ except ImportError:
     log.warn('Unable to hook into Proton main script environment')
 
 
+# Directory of protonfixes, which also contains winetricks, xrandr and verbs
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_PROTON_VERSION_RE = re.compile(r'Proton ([0-9]*\.[0-9]*)')
+_XRANDR_PRIMARY_RE = re.compile(r'\bprimary\s+(\d+)x(\d+)\+')
+
+
 def which(appname: str) -> Union[str, None]:
     """Returns the full path of an executable in $PATH"""
-    for path in os.environ['PATH'].split(os.pathsep):
-        fullpath = os.path.join(path, appname)
-        if os.path.exists(fullpath) and os.access(fullpath, os.X_OK):
-            return fullpath
-    log.warn(str(appname) + 'not found in $PATH')
-    return None
+    fullpath = shutil.which(appname)
+    if fullpath is None:
+        log.warn(str(appname) + ' not found in $PATH')
+    return fullpath
 
 
+@functools.lru_cache
 def protondir() -> str:
     """Returns the path to proton"""
     proton_dir = os.path.dirname(sys.argv[0])
     return proton_dir
 
 
+@functools.lru_cache
 def protonprefix() -> str:
     """Returns the wineprefix used by proton"""
     return os.path.join(os.environ['STEAM_COMPAT_DATA_PATH'], 'pfx/')
 
 
+@functools.lru_cache
 def protonnameversion() -> Union[str, None]:
     """Returns the version of proton from sys.argv[0]"""
-    version = re.search('Proton ([0-9]*\\.[0-9]*)', sys.argv[0])
+    version = _PROTON_VERSION_RE.search(sys.argv[0])
     if version:
         return version.group(1)
     log.warn('Proton version not parsed from command line')
     return None
 
 
+@functools.lru_cache
 def protontimeversion() -> int:
     """Returns the version timestamp of proton from the `version` file"""
     fullpath = os.path.join(protondir(), 'version')
     try:
         with open(fullpath, encoding='ascii') as version:
-            for timestamp in version.readlines():
-                return int(timestamp.strip())
+            timestamp = version.readline().strip()
+            if timestamp:
+                return int(timestamp)
     except OSError:
         log.warn('Proton version file not found in: ' + fullpath)
         return 0
@@ -80,6 +91,10 @@ def protonversion(timestamp: bool = False) -> Union[str, None, int]:
     return protonnameversion()
 
 
+# Functions decorated with once() that already ran, keyed by marker directory
+_once_done: dict[str, set[str]] = {}
+
+
 def once(
     func: Union[Callable, None] = None, retry: bool = False
 ) -> Union[None, Callable[..., Any]]:
@@ -94,6 +109,7 @@ def once(
     Implementation:
     Uses a file (one per function) in PROTONPREFIX/drive_c/protonfixes/run/
     to track if a function has already been run in this prefix.
+    The directory is only listed once per process.
     """
     if func is None:
         return functools.partial(once, retry=retry)
@@ -103,9 +119,13 @@ def once(
         prefix = protonprefix()
         directory = os.path.join(prefix, 'drive_c/protonfixes/run/')
         file = os.path.join(directory, func_id)
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-        if os.path.exists(file):
+        done = _once_done.get(directory)
+        if done is None:
+            os.makedirs(directory, exist_ok=True)
+            with os.scandir(directory) as entries:
+                done = {entry.name for entry in entries}
+            _once_done[directory] = done
+        if func_id in done:
             return
 
         exception = None
@@ -116,8 +136,8 @@ def once(
                 raise exc
             exception = exc
 
-        with open(file, 'a', encoding='ascii') as tmp:
-            tmp.close()
+        os.close(os.open(file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644))
+        done.add(func_id)
 
         if exception:
             raise exception
@@ -129,10 +149,17 @@ def once(
 
 def _killhanging() -> None:
     """Kills processes that hang when installing winetricks"""
-    # avoiding an external library as proc should be available on linux
     log.debug('Killing hanging wine processes')
-    pids = [pid for pid in os.listdir('/proc') if pid.isdigit()]
     badexes = ['mscorsvw.exe']
+
+    pkill_bin = shutil.which('pkill')
+    if pkill_bin:
+        for exe in badexes:
+            subprocess.run([pkill_bin, '-KILL', '-f', exe], check=False)
+        return
+
+    # avoiding an external library as proc should be available on linux
+    pids = [pid for pid in os.listdir('/proc') if pid.isdigit()]
     for pid in pids:
         try:
             with open(os.path.join('/proc', pid, 'cmdline'), 'rb') as proc_cmd:
@@ -144,11 +171,36 @@ def _killhanging() -> None:
             continue
 
 
+# Stripped lines of the winetricks logs, keyed by log file name
+_winetricks_logs: dict[str, list[str]] = {}
+
+
 def _forceinstalled(verb: str) -> None:
     """Records verb into the winetricks.log.forced file"""
     forced_log = os.path.join(protonprefix(), 'winetricks.log.forced')
-    with open(forced_log, 'a', encoding='ascii') as forcedlog:
-        forcedlog.write(verb + '\n')
+    forcedlog = os.open(forced_log, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        os.write(forcedlog, (verb + '\n').encode('ascii'))
+    finally:
+        os.close(forcedlog)
+    _winetricks_logs.pop('winetricks.log.forced', None)
+
+
+def _read_winetricks_log(logfile: str) -> list[str]:
+    """Returns the lines of a winetricks log, which is read once per process
+
+    The cache is invalidated whenever winetricks runs or a verb is forced.
+    """
+    lines = _winetricks_logs.get(logfile)
+    if lines is None:
+        try:
+            winetricks_log = os.path.join(protonprefix(), logfile)
+            with open(winetricks_log, encoding='ascii') as tricklog:
+                lines = [x.strip() for x in tricklog]
+        except OSError:
+            lines = []
+        _winetricks_logs[logfile] = lines
+    return lines
 
 
 def _checkinstalled(verb: str, logfile: str = 'winetricks.log') -> bool:
@@ -156,29 +208,18 @@ def _checkinstalled(verb: str, logfile: str = 'winetricks.log') -> bool:
     if not isinstance(verb, str):
         return False
 
-    winetricks_log = os.path.join(protonprefix(), logfile)
+    tricklog = _read_winetricks_log(logfile)
 
-    # Check for 'verb=param' verb types
-    if len(verb.split('=')) > 1:
-        wt_verb = verb.split('=')[0] + '='
-        wt_verb_param = verb.split('=')[1]
-        wt_is_set = False
-        try:
-            with open(winetricks_log, encoding='ascii') as tricklog:
-                for xline in tricklog.readlines():
-                    if re.findall(r'^' + wt_verb, xline.strip()):
-                        wt_is_set = bool(xline.strip() == wt_verb + wt_verb_param)
-            return wt_is_set
-        except OSError:
-            return False
+    # Check for 'verb=param' verb types, the last setting wins
+    if '=' in verb:
+        wt_verb = verb.split('=', 1)[0] + '='
+        wt_last = None
+        for xline in tricklog:
+            if xline.startswith(wt_verb):
+                wt_last = xline
+        return wt_last == verb
     # Check for regular verbs
-    try:
-        with open(winetricks_log, encoding='ascii') as tricklog:
-            if verb in reversed([x.strip() for x in tricklog.readlines()]):
-                return True
-    except OSError:
-        return False
-    return False
+    return verb in tricklog
 
 
 def checkinstalled(verb: str) -> bool:
@@ -192,8 +233,12 @@ def checkinstalled(verb: str) -> bool:
     return _checkinstalled(verb)
 
 
+@functools.lru_cache(maxsize=128)
 def is_custom_verb(verb: str) -> Union[bool, str]:
-    """Returns path to custom winetricks verb, if found"""
+    """Returns path to custom winetricks verb, if found
+
+    Custom verbs do not appear while running, so the result is cached.
+    """
     if verb == 'gui':
         return False
 
@@ -202,28 +247,82 @@ def is_custom_verb(verb: str) -> Union[bool, str]:
 
     # check local custom verbs
     verbpath = os.path.expanduser('~/.config/protonfixes/localfixes/' + verb_dir)
-    if os.path.isfile(os.path.join(verbpath, verb_name)):
+    verbfile = os.path.join(verbpath, verb_name)
+    if os.path.isfile(verbfile):
         log.debug('Using local custom winetricks verb from: ' + verbpath)
-        return os.path.join(verbpath, verb_name)
+        return verbfile
 
     # check custom verbs
-    verbpath = os.path.join(os.path.dirname(__file__), verb_dir)
-    if os.path.isfile(os.path.join(verbpath, verb_name)):
+    verbpath = os.path.join(_MODULE_DIR, verb_dir)
+    verbfile = os.path.join(verbpath, verb_name)
+    if os.path.isfile(verbfile):
         log.debug('Using custom winetricks verb from: ' + verbpath)
-        return os.path.join(verbpath, verb_name)
+        return verbfile
 
     return False
 
 
+# Last result of check_internet() as (time.monotonic(), result)
+_internet_checked: Union[tuple[float, bool], None] = None
+
+
 def check_internet() -> bool:
-    """Checks for internet connection."""
+    """Checks for internet connection.
+
+    The result is cached for 30 seconds, a failed check only for 5 seconds.
+    """
+    global _internet_checked
+    if _internet_checked is not None:
+        checked_at, result = _internet_checked
+        if time.monotonic() - checked_at < (30 if result else 5):
+            return result
+
     try:
         with socket(AF_INET, SOCK_DGRAM) as sock:
             sock.settimeout(5)
             sock.connect(('1.1.1.1', 53))
-        return True
+        result = True
     except (TimeoutError, OSError):
-        return False
+        result = False
+    _internet_checked = (time.monotonic(), result)
+    return result
+
+
+def _wine_env() -> dict[str, str]:
+    """Returns a copy of the Proton environment, set up to run wine in the prefix"""
+    return protonmain.g_session.env | {
+        'WINEPREFIX': protonprefix(),
+        'WINE': protonmain.g_proton.wine_bin,
+        'WINELOADER': protonmain.g_proton.wine_bin,
+        'WINESERVER': protonmain.g_proton.wineserver_bin,
+    }
+
+
+def _run_winetricks(args: list[str]) -> int:
+    """Runs winetricks unattended with the given arguments
+
+    Returns the exit status of winetricks.
+    """
+    env = _wine_env()
+    env['WINETRICKS_LATEST_VERSION_CHECK'] = 'disabled'
+    env['LD_PRELOAD'] = ''
+
+    winetricks_bin = os.path.join(_MODULE_DIR, 'winetricks')
+    winetricks_cmd = [winetricks_bin, '--unattended'] + args
+    log.debug('Using winetricks command: ' + str(winetricks_cmd))
+
+    # make sure proton waits for winetricks to finish
+    for idx, arg in enumerate(sys.argv):
+        if arg == 'run':
+            sys.argv[idx] = 'waitforexitandrun'
+    log.debug(str(sys.argv))
+
+    subprocess.call([env['WINESERVER'], '-w'], env=env)
+    with subprocess.Popen(winetricks_cmd, env=env) as process:
+        process.wait()
+    _killhanging()
+    _winetricks_logs.clear()
+    return process.returncode
 
 
 def protontricks(verb: str) -> bool:
@@ -237,57 +336,69 @@ def protontricks(verb: str) -> bool:
             return False
 
         log.info('Installing winetricks ' + verb)
-        env = dict(protonmain.g_session.env)
-        env['WINEPREFIX'] = protonprefix()
-        env['WINE'] = protonmain.g_proton.wine_bin
-        env['WINELOADER'] = protonmain.g_proton.wine_bin
-        env['WINESERVER'] = protonmain.g_proton.wineserver_bin
-        env['WINETRICKS_LATEST_VERSION_CHECK'] = 'disabled'
-        env['LD_PRELOAD'] = ''
-
-        winetricks_bin = os.path.abspath(__file__).replace('util.py', 'winetricks')
-        winetricks_cmd = [winetricks_bin, '--unattended'] + verb.split(' ')
+        winetricks_args = verb.split(' ')
         if verb == 'gui':
-            winetricks_cmd = [winetricks_bin, '--unattended']
+            winetricks_args = []
 
         # check is verb a custom winetricks verb
         custom_verb = is_custom_verb(verb)
         if custom_verb:
-            winetricks_cmd = [winetricks_bin, '--unattended', custom_verb]
+            winetricks_args = [custom_verb]
 
-        if winetricks_bin is None:
-            log.warn('No winetricks was found in $PATH')
+        log.info('Using winetricks verb ' + verb)
+        retc = _run_winetricks(winetricks_args)
 
-        if winetricks_bin is not None:
-            log.debug('Using winetricks command: ' + str(winetricks_cmd))
+        # Check if the verb failed (eg. access denied)
+        if retc != 0:
+            log.warn(f'Winetricks failed running verb "{verb}" with status {retc}.')
+            return False
 
-            # make sure proton waits for winetricks to finish
-            for idx, arg in enumerate(sys.argv):
-                if 'waitforexitandrun' not in arg:
-                    sys.argv[idx] = arg.replace('run', 'waitforexitandrun')
-                    log.debug(str(sys.argv))
+        # Check if verb recorded to winetricks log
+        if not checkinstalled(verb):
+            log.warn(f'Not recorded as installed: winetricks {verb}, forcing!')
+            _forceinstalled(verb)
 
-            log.info('Using winetricks verb ' + verb)
-            subprocess.call([env['WINESERVER'], '-w'], env=env)
-            with subprocess.Popen(winetricks_cmd, env=env) as process:
-                process.wait()
-            _killhanging()
+        log.info('Winetricks complete')
+        return True
 
-            # Check if the verb failed (eg. access denied)
-            retc = process.returncode
-            if retc != 0:
-                log.warn(f'Winetricks failed running verb "{verb}" with status {retc}.')
-                return False
+    return False
 
-            # Check if verb recorded to winetricks log
-            if not checkinstalled(verb):
-                log.warn(f'Not recorded as installed: winetricks {verb}, forcing!')
-                _forceinstalled(verb)
 
-            log.info('Winetricks complete')
-            return True
+def protontricks_many(*verbs: str) -> bool:
+    """Runs winetricks once for all verbs, that are not installed yet
 
-    return False
+    All missing verbs are passed to a single winetricks invocation,
+    instead of starting winetricks (and the wineserver) for each verb.
+    """
+    missing = [verb for verb in verbs if not checkinstalled(verb)]
+    if not missing:
+        return False
+
+    if not check_internet():
+        log.info('No internet connection. Winetricks will be skipped.')
+        return False
+
+    log.info('Installing winetricks ' + ' '.join(missing))
+    # check for custom winetricks verbs
+    winetricks_args = [is_custom_verb(verb) or verb for verb in missing]
+
+    retc = _run_winetricks(winetricks_args)
+
+    # Check if the verbs failed (eg. access denied)
+    if retc != 0:
+        log.warn(
+            f'Winetricks failed running verbs "{" ".join(missing)}" with status {retc}.'
+        )
+        return False
+
+    # Check if verbs recorded to winetricks log
+    for verb in missing:
+        if not checkinstalled(verb):
+            log.warn(f'Not recorded as installed: winetricks {verb}, forcing!')
+            _forceinstalled(verb)
+
+    log.info('Winetricks complete')
+    return True
 
 
 def regedit_add(
@@ -298,11 +409,7 @@ def regedit_add(
     arch: bool = False,
 ) -> None:
     """Add regedit keys"""
-    env = dict(protonmain.g_session.env)
-    env['WINEPREFIX'] = protonprefix()
-    env['WINE'] = protonmain.g_proton.wine_bin
-    env['WINELOADER'] = protonmain.g_proton.wine_bin
-    env['WINESERVER'] = protonmain.g_proton.wineserver_bin
+    env = _wine_env()
 
     if name is not None and typ is not None and value is not None:
         # Flag for if we want to force writing to the 64-bit registry sector
@@ -362,9 +469,12 @@ def replace_command(
     By default the search is case insensitive,
     you can override this behaviour with re.RegexFlag.NOFLAG
     """
+    pattern = re.compile(orig, match_flags)
     found = False
     for idx, arg in enumerate(sys.argv):
-        replaced = re.sub(orig, repl, arg, flags=match_flags)
+        if pattern.search(arg) is None:
+            continue
+        replaced = pattern.sub(repl, arg)
         if replaced == arg:
             continue
         sys.argv[idx] = replaced
@@ -391,6 +501,14 @@ def set_environment(envvar: str, value: str) -> None:
     protonmain.g_session.env[envvar] = value
 
 
+def set_environment_many(envvars: Mapping[str, str]) -> None:
+    """Add or override multiple environment values at once"""
+    for envvar, value in envvars.items():
+        log.info(f'Adding env: {envvar}={value}')
+    os.environ.update(envvars)
+    protonmain.g_session.env.update(envvars)
+
+
 def del_environment(envvar: str) -> None:
     """Remove an environment variable"""
     log.info('Removing env: ' + envvar)
@@ -400,6 +518,7 @@ def del_environment(envvar: str) -> None:
         del protonmain.g_session.env[envvar]
 
 
+@functools.lru_cache
 def get_game_install_path() -> str:
     """Game installation path"""
     install_path = os.environ['PWD']
@@ -419,6 +538,25 @@ def winedll_override(dll: str, dtype: Literal['n', 'b', 'n,b', 'b,n', '']) -> No
     )
 
 
+def winedll_override_many(
+    overrides: Mapping[str, Literal['n', 'b', 'n,b', 'b,n', '']],
+) -> None:
+    """Add multiple WINE dll overrides at once"""
+    if not overrides:
+        return
+    for dll, dtype in overrides.items():
+        log.info(f'Overriding {dll}.dll = {dtype}')
+    setting = ';'.join(f'{dll}={dtype}' for dll, dtype in overrides.items())
+    protonmain.append_to_env_str(
+        protonmain.g_session.env, 'WINEDLLOVERRIDES', setting, ';'
+    )
+
+
+# Byte sequences replaced in libcuda.so by patch_libcuda()
+_LIBCUDA_ORIGINAL_BYTES = bytes.fromhex('000000f8ff000000')
+_LIBCUDA_PATCHED_BYTES = bytes.fromhex('000000f8ffff0000')
+
+
 def patch_libcuda() -> bool:
     """Patches libcuda to work around games that crash when initializing libcuda and are using DLSS.
 
@@ -438,30 +576,22 @@ def patch_libcuda() -> bool:
             log.warn('ldconfig not found in PATH.')
             return False
 
-        # Use subprocess.run with capture_output and explicit encoding handling
+        # Use subprocess.run with capture_output, the output is parsed as bytes
         try:
             result = subprocess.run(
                 [ldconfig_path, '-p'], capture_output=True, check=True
             )
-            # Decode the output using utf-8 with fallback to locale preferred encoding
-            try:
-                output = result.stdout.decode('utf-8')
-            except UnicodeDecodeError:
-                import locale
-
-                encoding = locale.getpreferredencoding(False)
-                output = result.stdout.decode(encoding, errors='replace')
         except subprocess.CalledProcessError as e:
             log.warn(f'Error running ldconfig: {e}')
             return False
 
         libcuda_path = None
-        for line in output.splitlines():
-            if 'libcuda.so' in line and 'x86-64' in line:
-                # Parse the line to extract the path
-                parts = line.strip().split(' => ')
+        for line in result.stdout.splitlines():
+            if b'libcuda.so' in line and b'x86-64' in line:
+                # Parse the line to extract the path, only matching lines are decoded
+                parts = line.strip().split(b' => ')
                 if len(parts) == 2:
-                    path = parts[1].strip()
+                    path = os.fsdecode(parts[1].strip())
                     if os.path.exists(path):
                         libcuda_path = os.path.abspath(path)
                         break
@@ -491,9 +621,9 @@ def patch_libcuda() -> bool:
         # failures without disabling the extensions, thus enabling DLSS to work properly.
         # The hex replacement changes the memory allocation constraints within libcuda.so.
 
-        hex_data = binary_data.hex()
-        hex_data = hex_data.replace('000000f8ff000000', '000000f8ffff0000')
-        patched_binary_data = bytes.fromhex(hex_data)
+        patched_binary_data = binary_data.replace(
+            _LIBCUDA_ORIGINAL_BYTES, _LIBCUDA_PATCHED_BYTES
+        )
 
         try:
             with open(patched_library, 'wb') as f:
@@ -518,12 +648,16 @@ def patch_libcuda() -> bool:
 def disable_nvapi() -> None:
     """Disable WINE nv* dlls"""
     log.info('Disabling NvAPI')
-    winedll_override('nvapi', '')
-    winedll_override('nvapi64', '')
-    winedll_override('nvcuda', '')
-    winedll_override('nvcuvid', '')
-    winedll_override('nvencodeapi', '')
-    winedll_override('nvencodeapi64', '')
+    winedll_override_many(
+        {
+            'nvapi': '',
+            'nvapi64': '',
+            'nvcuda': '',
+            'nvcuvid': '',
+            'nvencodeapi': '',
+            'nvencodeapi64': '',
+        }
+    )
 
 
 def disable_esync() -> None:
@@ -541,10 +675,14 @@ def disable_fsync() -> None:
 def disable_protonmediaconverter() -> None:
     """Disabling Proton Media Converter"""
     log.info('Disabling Proton Media Converter')
-    set_environment('PROTON_AUDIO_CONVERT', '0')
-    set_environment('PROTON_AUDIO_CONVERT_BIN', '0')
-    set_environment('PROTON_VIDEO_CONVERT', '0')
-    set_environment('PROTON_DEMUX', '0')
+    set_environment_many(
+        {
+            'PROTON_AUDIO_CONVERT': '0',
+            'PROTON_AUDIO_CONVERT_BIN': '0',
+            'PROTON_VIDEO_CONVERT': '0',
+            'PROTON_DEMUX': '0',
+        }
+    )
 
 
 @once
@@ -624,16 +762,15 @@ def _get_case_insensitive_name(path: str) -> str:
     for directory in s_working_dir:
         if not os.path.exists(root):
             break
-        dir_list = os.listdir(root)
-        found = False
-        for existing_dir in dir_list:
-            # Find matching filename on drive
-            if existing_dir.lower() == directory.lower():
-                root = os.path.join(root, existing_dir)
-                paths_found += 1
-                found = True
+        # Find matching filename on drive
+        target = directory.lower()
+        with os.scandir(root) as entries:
+            match = next((e.name for e in entries if e.name.lower() == target), None)
+        if match is not None:
+            root = os.path.join(root, match)
+            paths_found += 1
         # If path was not found append case that we were looking for
-        if not found:
+        else:
             root = os.path.join(root, directory)
             paths_found += 1
 
@@ -668,6 +805,9 @@ def _get_config_full_path(cfile: str, base_path: str) -> Union[str, None]:
 def create_backup_config(cfg_path: str) -> None:
     """Create backup config file"""
     # Backup
+    # This must be a real copy, not a hardlink: the config is rewritten in place
+    # afterwards, which would change a hardlinked backup as well.
+    # shutil.copyfile already uses an in-kernel copy (sendfile) on Linux.
     if not os.path.exists(cfg_path + '.protonfixes.bak'):
         log.info('Creating backup for config file')
         shutil.copyfile(cfg_path, cfg_path + '.protonfixes.bak')
@@ -709,8 +849,7 @@ def set_xml_options(
 
     create_backup_config(xml_path)
 
-    # set options
-
+    # Only patch the unmodified config, the backup has the original size
     base_size = os.path.getsize(xml_path)
     backup_size = os.path.getsize(xml_path + '.protonfixes.bak')
 
@@ -719,16 +858,17 @@ def set_xml_options(
 
     with open(xml_path, encoding='utf-8') as file:
         contents = file.readlines()
-        i = 0
-        for line in contents:
-            i += 1
-            if base_attibutte in line:
-                log.info(f'Adding XML options into {cfile}, line {i}:\n{xml_line}')
-                contents.insert(i, xml_line + '\n')
+
+    # Build the patched file in one pass, instead of inserting into the list
+    patched = []
+    for i, line in enumerate(contents, 1):
+        patched.append(line)
+        if base_attibutte in line:
+            log.info(f'Adding XML options into {cfile}, line {i}:\n{xml_line}')
+            patched.append(xml_line + '\n')
 
     with open(xml_path, 'w', encoding='utf-8') as file:
-        for eachitem in contents:
-            file.write(eachitem)
+        file.writelines(patched)
 
     log.info('XML config patch applied')
     return True
@@ -737,18 +877,16 @@ def set_xml_options(
 def get_resolution() -> tuple[int, int]:
     """Returns screen res width, height using xrandr"""
     # Execute xrandr command and capture its output
-    xrandr_bin = os.path.abspath(__file__).replace('util.py', 'xrandr')
-    xrandr_output = subprocess.check_output([xrandr_bin, '--current']).decode('utf-8')
+    xrandr_bin = os.path.join(_MODULE_DIR, 'xrandr')
+    xrandr_output = subprocess.run(
+        [xrandr_bin, '--current'], capture_output=True, check=True
+    ).stdout.decode('utf-8')
 
-    # Find the line that starts with 'Screen   0:' and extract the resolution
+    # Find the primary output and extract its resolution
     for line in xrandr_output.splitlines():
-        if 'primary' in line:
-            resolution = line.split()[3]
-            width_height = resolution.split('x')
-            offset_values = width_height[1].split('+')
-            clean_resolution = width_height[0] + 'x' + offset_values[0]
-            screenx, screeny = clean_resolution.split('x')
-            return (int(screenx), int(screeny))
+        resolution = _XRANDR_PRIMARY_RE.search(line)
+        if resolution:
+            return (int(resolution.group(1)), int(resolution.group(2)))
 
     # If no resolution is found, return default values or raise an exception
     return (0, 0)  # or raise Exception('Resolution not found')
@@ -760,6 +898,10 @@ def read_dxvk_conf(cfp: TextIOWrapper) -> Generator[str, None, None]:
     yield from cfp
 
 
+# DXVK configs created in this session, keyed by their file path
+_dxvk_configs: dict[str, configparser.ConfigParser] = {}
+
+
 def set_dxvk_option(
     opt: str, val: str, cfile: str = '/tmp/protonfixes_dxvk.conf'
 ) -> None:
@@ -767,33 +909,28 @@ def set_dxvk_option(
 
     See https://github.com/doitsujin/dxvk/wiki/Configuration for details
     """
-    conf = configparser.ConfigParser()
-    conf.optionxform = str
-    section = conf.default_section
-    dxvk_conf = os.path.join(os.environ['PWD'], 'dxvk.conf')
-
-    conf.read(cfile)
-
-    if (
-        not conf.has_option(section, 'session')
-        or conf.getint(section, 'session') != os.getpid()
-    ):
+    conf = _dxvk_configs.get(cfile)
+    if conf is None:
         log.info('Creating new DXVK config')
         set_environment('DXVK_CONFIG_FILE', cfile)
 
         conf = configparser.ConfigParser()
         conf.optionxform = str
+        section = conf.default_section
         conf.set(section, 'session', str(os.getpid()))
 
+        dxvk_conf = os.path.join(os.environ['PWD'], 'dxvk.conf')
         if os.access(dxvk_conf, os.F_OK):
             with open(dxvk_conf, encoding='ascii') as dxvk:
                 conf.read_file(read_dxvk_conf(dxvk))
         log.debug(f'{conf.items(section)}')
+        _dxvk_configs[cfile] = conf
 
     # set option
     log.info('Addinging DXVK option: ' + str(opt) + ' = ' + str(val))
-    conf.set(section, opt, str(val))
+    conf.set(conf.default_section, opt, str(val))
 
+    # The file is written right away, as DXVK reads it when the game starts
     with open(cfile, 'w', encoding='ascii') as configfile:
         conf.write(configfile)
 
@@ -808,25 +945,57 @@ def install_battleye_runtime() -> None:
     install_app('1161040')
 
 
-def install_all_from_tgz(url: str, path: str = os.getcwd()) -> None:
-    """Install all files from a downloaded tar.gz"""
+def _download_file(url: str, file_path: str) -> None:
+    """Download a file in large chunks
+
+    The download is written to a temporary file first, so that an
+    interrupted download does not leave a broken file in the cache.
+    """
+    part_path = file_path + '.part'
+    with urllib.request.urlopen(url) as resp, open(part_path, 'wb') as file:
+        shutil.copyfileobj(resp, file, 1024 * 1024)
+    os.replace(part_path, file_path)
+
+
+def _extract_all_from_tgz(tgz_obj: tarfile.TarFile, path: str) -> None:
+    """Extract all files from an opened tar archive"""
+    # Extraction filters are available since Python 3.12 (and some backports)
+    if hasattr(tarfile, 'data_filter'):
+        tgz_obj.extractall(path, filter='data')
+    else:
+        tgz_obj.extractall(path)
+
+
+def install_all_from_tgz(url: str, path: str = os.getcwd(), cache: bool = True) -> None:
+    """Install all files from a downloaded tar.gz
+
+    If `cache` is False and the archive was not downloaded before,
+    it is extracted while downloading, without storing it on disk.
+    """
     cache_dir = os.path.expanduser('~/.cache/protonfixes')
     os.makedirs(cache_dir, exist_ok=True)
     tgz_file_name = os.path.basename(url)
     tgz_file_path = os.path.join(cache_dir, tgz_file_name)
 
-    if tgz_file_name not in os.listdir(cache_dir):
+    if not os.path.isfile(tgz_file_path):
+        if not cache:
+            log.info(f'Downloading and extracting {tgz_file_name} to {path}')
+            with urllib.request.urlopen(url) as resp:
+                with tarfile.open(fileobj=resp, mode='r|gz') as tgz_obj:
+                    _extract_all_from_tgz(tgz_obj, path)
+            return
+
         log.info('Downloading ' + tgz_file_name)
-        urllib.request.urlretrieve(url, tgz_file_path)
+        _download_file(url, tgz_file_path)
 
     with tarfile.open(tgz_file_path, 'r:gz') as tgz_obj:
         log.info(f'Extracting {tgz_file_name} to {path}')
-        tgz_obj.extractall(path)
+        _extract_all_from_tgz(tgz_obj, path)
 
 
 def install_from_zip(url: str, filename: str, path: str = os.getcwd()) -> None:
     """Install a file from a downloaded zip"""
-    if filename in os.listdir(path):
+    if os.path.exists(os.path.join(path, filename)):
         log.info(f'File {filename} found in {path}')
         return
 
@@ -835,9 +1004,9 @@ def install_from_zip(url: str, filename: str, path: str = os.getcwd()) -> None:
     zip_file_name = os.path.basename(url)
     zip_file_path = os.path.join(cache_dir, zip_file_name)
 
-    if zip_file_name not in os.listdir(cache_dir):
+    if not os.path.isfile(zip_file_path):
         log.info(f'Downloading {filename} to {zip_file_path}')
-        urllib.request.urlretrieve(url, zip_file_path)
+        _download_file(url, zip_file_path)
 
     with zipfile.ZipFile(zip_file_path, 'r') as zip_obj:
         log.info(f'Extracting {filename} to {path}')
@@ -862,27 +1031,63 @@ def try_show_gui_error(text: str) -> None:
             log.info('Failed to show error message with the following text: ' + text)
 
 
+def _count_cpu_list(cpu_list: str) -> int:
+    """Returns the count of cpus in a sysfs cpu list, eg. '0-3,8-11' is 8"""
+    count = 0
+    for cpu_range in cpu_list.strip().split(','):
+        if not cpu_range:
+            continue
+        first, _, last = cpu_range.partition('-')
+        count += int(last or first) - int(first) + 1
+    return count
+
+
+@functools.lru_cache
 def is_smt_enabled() -> bool:
     """Returns whether SMT is enabled.
 
     If the check has failed, False is returned.
+    The SMT status is read once per process.
     """
     try:
-        with open('/sys/devices/system/cpu/smt/active', encoding='ascii') as smt_file:
-            return smt_file.read().strip() == '1'
+        smt_file = os.open('/sys/devices/system/cpu/smt/active', os.O_RDONLY)
+        try:
+            # The file contains '0\n' or '1\n'
+            return os.read(smt_file, 2)[:1] == b'1'
+        finally:
+            os.close(smt_file)
+    except PermissionError:
+        log.warn('No permission to read SMT status')
+        return False
+    except OSError:
+        pass
+
+    # Kernels without smt/active: SMT is on, if the first core has sibling threads
+    siblings_list = '/sys/devices/system/cpu/cpu0/topology/thread_siblings_list'
+    try:
+        with open(siblings_list, encoding='ascii') as siblings_file:
+            return _count_cpu_list(siblings_file.read()) > 1
     except PermissionError:
         log.warn('No permission to read SMT status')
     except OSError as ex:
         log.warn(f'SMT status not supported by the kernel (errno: {ex.errno})')
+    except ValueError:
+        log.warn(f'Can not parse SMT status from {siblings_list}')
     return False
 
 
+@functools.lru_cache
 def get_cpu_count() -> int:
     """Returns the cpu core count, provided by the OS.
 
+    Cores excluded by the cpu affinity (eg. taskset or cgroups) are not counted.
     If the request failed, 0 is returned.
+    The core count is read once per process.
     """
-    cpu_cores = os.cpu_count()
+    try:
+        cpu_cores = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpu_cores = os.cpu_count()
     if not cpu_cores or cpu_cores <= 0:
         log.warn('Can not read count of logical cpu cores')
         return 0
@@ -908,7 +1113,8 @@ def set_cpu_topology(core_count: int, ignore_user_setting: bool = False) -> bool
 
     # Format (example, 4 cores): 4:0,1,2,3
     cpu_topology = f'{core_count}:{",".join(map(str, range(core_count)))}'
-    set_environment('WINE_CPU_TOPOLOGY', cpu_topology)
+    if user_topo != cpu_topology:
+        set_environment('WINE_CPU_TOPOLOGY', cpu_topology)
     log.info(f'Using WINE_CPU_TOPOLOGY: {cpu_topology}')
     return True
 
@@ -922,13 +1128,14 @@ def set_cpu_topology_nosmt(
     You can limit the core count to the `core_limit` argument.
     """
     # Check first, if SMT is enabled
-    if is_smt_enabled() is False:
+    if not is_smt_enabled():
         log.info('SMT is not active, skipping fix')
         return False
 
     # Currently (2024) SMT allows 2 threads per core, this might change in the future
     cpu_cores = get_cpu_count() // threads_per_core  # Apply divider
-    cpu_cores = max(cpu_cores, min(cpu_cores, core_limit))  # Apply limit
+    if core_limit > 0:
+        cpu_cores = min(cpu_cores, core_limit)  # Apply limit
     return set_cpu_topology(cpu_cores, ignore_user_setting)
 
 
@@ -937,6 +1144,11 @@ def set_cpu_topology_limit(core_limit: int, ignore_user_setting: bool = False) -
 
     A limit that exceeds the available cores, will be ignored.
     """
+    # Sanity check, before querying the cpu
+    if core_limit <= 0:
+        log.warn('Only positive core_limits can be used to set cpu topology')
+        return False
+
     cpu_cores = get_cpu_count()
     if core_limit >= cpu_cores:
         log.info(